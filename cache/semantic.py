@@ -0,0 +1,105 @@
+import os
+import re
+import json
+import math
+import zlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+Vector = Dict[int, float]
+
+
+def embed(text: str, dims: int = 64) -> Vector:
+    vec: Vector = {}
+    for token in _TOKEN_RE.findall(text.lower()):
+        bucket = zlib.crc32(token.encode("utf-8")) % dims
+        vec[bucket] = vec.get(bucket, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in vec.values()))
+    if not norm:
+        return vec
+    return {k: v / norm for k, v in vec.items()}
+
+
+def cosine(a: Vector, b: Vector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+class SemanticCache:
+    def __init__(self, path: Optional[str] = None, max_entries: int = 256, threshold: float = 0.92, dims: int = 64):
+        self.path = os.path.expanduser(path) if path else None
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.dims = dims
+        self._entries: "OrderedDict[str, Tuple[Vector, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def get(self, text: str) -> Optional[str]:
+        with self._lock:
+            self._ensure_loaded()
+            if text in self._entries:
+                self._entries.move_to_end(text)
+                return self._entries[text][1]
+
+            query_vec = embed(text, self.dims)
+            best_key, best_score = None, self.threshold
+            for key, (vec, _) in self._entries.items():
+                score = cosine(query_vec, vec)
+                if score >= best_score:
+                    best_key, best_score = key, score
+
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key][1]
+
+    def put(self, text: str, value: str) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            self._entries[text] = (embed(text, self.dims), value)
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for entry in data.get("entries", [])[-self.max_entries:]:
+                text, value = entry["query"], entry["value"]
+                self._entries[text] = (embed(text, self.dims), value)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug("Ignoring unreadable semantic cache %s: %s", self.path, e)
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        payload = {"entries": [{"query": k, "value": v} for k, (_, v) in self._entries.items()]}
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix=".semantic_cache_", dir=os.path.dirname(self.path) or ".")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.debug("Could not persist semantic cache %s: %s", self.path, e)
+            if tmp_path:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
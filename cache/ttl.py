@@ -0,0 +1,43 @@
+import time
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Optional, Tuple
+
+
+def ttl_cache(seconds: float, cache_falsy: bool = False, maxsize: Optional[int] = 128):
+    def decorator(func: Callable) -> Callable:
+        entries: "OrderedDict[Tuple, Tuple[Any, float]]" = OrderedDict()
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            with lock:
+                entry = entries.get(key)
+                if entry is not None:
+                    if entry[1] > time.monotonic():
+                        entries.move_to_end(key)
+                        return entry[0]
+                    del entries[key]
+
+            value = func(*args, **kwargs)
+            if value or cache_falsy:
+                with lock:
+                    now = time.monotonic()
+                    for stale in [k for k, (_, expires) in entries.items() if expires <= now]:
+                        del entries[stale]
+                    entries[key] = (value, now + seconds)
+                    entries.move_to_end(key)
+                    if maxsize is not None:
+                        while len(entries) > maxsize:
+                            entries.popitem(last=False)
+            return value
+
+        def cache_clear() -> None:
+            with lock:
+                entries.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
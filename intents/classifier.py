@@ -1,20 +1,11 @@
 import os
-import json
+import re
 import logging
-from typing import Literal, Optional
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import Literal, Optional, Tuple
 
-try:
-    from openai import OpenAI
-except ImportError:
-    OpenAI = None
-
-from tools.search import run_zen_research
-from tools.code_interpreter import run_code_interpreter
-from tools.computer_use import ComputerUseAgent
-from tools.chat import ChatTool
-
-load_dotenv()
+from cache.semantic import SemanticCache
+from utils import fastjson
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,86 +13,167 @@ logger = logging.getLogger(__name__)
 Intent = Literal["web", "code", "computer", "chat"]
 VALID_INTENTS = {"web", "code", "computer", "chat"}
 
+SYSTEM_MSG = (
+    "You are a routing classifier for an AI assistant named Zen. "
+    "Return only a JSON object with the key 'intent'. "
+    "Valid intents: 'web', 'code', 'computer', 'chat'."
+)
+USER_MSG_TEMPLATE = (
+    "Query: {query}\n\n"
+    "Rules:\n"
+    "- Use 'web' for questions requiring internet search or fresh info.\n"
+    "- Use 'code' for Python code execution tasks.\n"
+    "- Use 'computer' for automation (browsing, clicking, typing).\n"
+    "- Use 'chat' for general advice, conversation, or opinions.\n"
+    "- Always return a JSON object only."
+)
+INTENT_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "intent",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "intent": {"type": "string", "enum": ["web", "code", "computer", "chat"]},
+            },
+            "required": ["intent"],
+            "additionalProperties": False,
+        },
+    },
+}
+JSON_OBJECT_FORMAT = {"type": "json_object"}
+
+CODE_KEYWORDS = (
+    "python", "write code", "implement", "calculate", "plot", "script",
+    "function", "class", "regex", "pandas", "numpy", "matplotlib",
+    "execute", "run code", "simulate", "algorithm", "solve"
+)
+COMPUTER_KEYWORDS = (
+    "browse", "navigate", "click", "type", "screenshot", "automate",
+    "website", "webpage", "browser", "scroll", "hover", "extract text",
+    "fill form", "upload", "download", "search web"
+)
+
+_CODE_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, CODE_KEYWORDS)) + r")\b")
+_COMPUTER_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, COMPUTER_KEYWORDS)) + r")\b")
+_HEURISTIC_PATTERNS = (("code", _CODE_RE), ("computer", _COMPUTER_RE))
+
+WEAK_KEYWORDS = frozenset({
+    "implement", "calculate", "plot", "function", "class", "execute", "simulate", "solve",
+    "navigate", "click", "type", "scroll", "hover", "upload", "download",
+})
+CONFIDENT_SCORE = 2
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+MODEL = os.getenv("MODEL", "gpt-5-nano")
+
+_SCHEMA_UNSUPPORTED_MODELS = set()
+
+_INTENT_CACHE = SemanticCache(os.getenv("ZEN_INTENT_CACHE", "~/.zen_intent_cache.json"))
+
+
+@lru_cache(maxsize=1)
+def _get_openai():
+    try:
+        from openai import OpenAI
+    except ImportError:
+        return None
+    return OpenAI
+
+
+@lru_cache(maxsize=1)
+def _get_client():
+    return _get_openai()(api_key=OPENAI_API_KEY)
+
+
+def prewarm() -> bool:
+    if not OPENAI_API_KEY or _get_openai() is None:
+        return False
+    _get_client()
+    return True
+
 
 def classify_intent(query: str) -> Intent:
-    api_key = os.getenv("OPENAI_API_KEY")
-    model = os.getenv("MODEL", "gpt-5-nano")
+    heuristic, score = _heuristic_intent(query)
 
-    heuristic = _heuristic_intent(query)
+    if score >= CONFIDENT_SCORE:
+        logger.debug("Confident heuristic match (%d), skipping API call", score)
+        return heuristic
 
-    if OpenAI is None or not api_key:
+    if not OPENAI_API_KEY or _get_openai() is None:
         logger.debug("OpenAI not available, falling back to heuristic intent")
         return heuristic
 
+    normalized = _normalize_query(query)
+    cached = _INTENT_CACHE.get(normalized)
+    if cached in VALID_INTENTS:
+        logger.debug("Semantic cache hit for query, intent: %s", cached)
+        return cached
+
     try:
-        client = OpenAI(api_key=api_key)
-        system_msg = (
-            "You are a routing classifier for an AI assistant named Zen. "
-            "Return only a JSON object with keys 'intent' and 'confidence'. "
-            "Valid intents: 'web', 'code', 'computer', 'chat'."
-        )
-        user_msg = (
-            f"Query: {query}\n\n"
-            "Rules:\n"
-            "- Use 'web' for questions requiring internet search or fresh info.\n"
-            "- Use 'code' for Python code execution tasks.\n"
-            "- Use 'computer' for automation (browsing, clicking, typing).\n"
-            "- Use 'chat' for general advice, conversation, or opinions.\n"
-            "- Always return a JSON object only."
-        )
+        intent = _llm_intent(normalized, MODEL)
+    except Exception as e:
+        logger.error("Intent classification failed: %s", e)
+        return heuristic
 
+    if intent not in VALID_INTENTS:
+        logger.warning("Invalid intent from API: %s. Falling back to heuristic.", intent)
+        return heuristic
+    _INTENT_CACHE.put(normalized, intent)
+    return intent
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.split()).lower()
+
+
+@lru_cache(maxsize=1024)
+def _llm_intent(query: str, model: str) -> Optional[str]:
+    client = _get_client()
+    options = {}
+    if model.startswith("gpt-5"):
+        options["reasoning_effort"] = "minimal"
+    messages = [
+        {"role": "system", "content": SYSTEM_MSG},
+        {"role": "user", "content": USER_MSG_TEMPLATE.format(query=query)},
+    ]
+    resp = None
+    if model not in _SCHEMA_UNSUPPORTED_MODELS:
+        try:
+            resp = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                response_format=INTENT_RESPONSE_FORMAT,
+                n=1,
+                stream=False,
+                **options,
+            )
+        except Exception as e:
+            if getattr(e, "status_code", None) != 400:
+                raise
+            logger.debug("Model %s rejected the intent schema, retrying in JSON mode: %s", model, e)
+            _SCHEMA_UNSUPPORTED_MODELS.add(model)
+    if resp is None:
         resp = client.chat.completions.create(
             model=model,
-            messages=[
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": user_msg},
-            ],
-            response_format={"type": "json_object"},
+            messages=messages,
+            response_format=JSON_OBJECT_FORMAT,
+            n=1,
+            stream=False,
+            **options,
         )
 
-        content = resp.choices[0].message.content
-        data = json.loads(content)
-        intent = data.get("intent", heuristic).lower()
+    content = resp.choices[0].message.content
+    data = fastjson.loads(content)
+    intent = data.get("intent")
+    return intent.lower() if isinstance(intent, str) else None
 
-        if intent not in VALID_INTENTS:
-            logger.warning("Invalid intent from API: %s. Falling back to heuristic.", intent)
-            return heuristic
-        return intent
 
-    except Exception as e:
-        logger.error("Intent classification failed: %s", e)
-        return heuristic
-
-
-def _heuristic_intent(query: str) -> Intent:
+def _heuristic_intent(query: str) -> Tuple[Intent, int]:
     q = query.lower()
-    code_keywords = [
-        "python", "write code", "implement", "calculate", "plot", "script",
-        "function", "class", "regex", "pandas", "numpy", "matplotlib",
-        "execute", "run code", "simulate", "algorithm", "solve"
-    ]
-    computer_keywords = [
-        "browse", "navigate", "click", "type", "screenshot", "automate",
-        "website", "webpage", "browser", "scroll", "hover", "extract text",
-        "fill form", "upload", "download", "search web"
-    ]
-    if any(k in q for k in code_keywords):
-        return "code"
-    if any(k in q for k in computer_keywords):
-        return "computer"
-    return "chat"
-
-
-def route_query(intent: Intent, query: str):
-    routes = {
-        "code": run_code_interpreter,
-        "web": run_zen_research,
-        "computer": lambda q: ComputerUseAgent().run(q),
-        "chat": lambda q: ChatTool()._run(message=q),
-    }
-    handler = routes.get(intent, routes["chat"])
-    try:
-        return handler(query)
-    except Exception as e:
-        logger.error("Error routing query: %s", e)
-        return ChatTool()._run(message=query)
+    for intent, pattern in _HEURISTIC_PATTERNS:
+        hits = set(pattern.findall(q))
+        if hits:
+            return intent, len(hits - WEAK_KEYWORDS)
+    return "chat", 0
@@ -1,19 +1,19 @@
-from tools.search import run_zen_research
-from tools.code_interpreter import run_code_interpreter
-from tools.computer_use import ComputerUseAgent
-from tools.chat import ChatTool
-
 def route_query(intent: str, query: str):
     if intent == "code":
+        from tools.code_interpreter import run_code_interpreter
         return run_code_interpreter(query)
     elif intent == "web":
+        from tools.search import run_zen_research
         return run_zen_research(query)
     elif intent == "computer":
+        from tools.computer_use import ComputerUseAgent
         agent = ComputerUseAgent()
         return agent.run(query)
     elif intent == "chat":
+        from tools.chat import ChatTool
         tool = ChatTool()
         return tool._run(message=query)
     else:
+        from tools.chat import ChatTool
         tool = ChatTool()
         return tool._run(message=query)
@@ -1,22 +1,49 @@
 import os
 import sys
-from tools.search import run_zen_research
-from tools.code_interpreter import run_code_interpreter
+import logging
+import threading
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from dotenv import load_dotenv
 
-try:
-    from openai import OpenAI
-except Exception:
-    OpenAI = None
-
 load_dotenv()
 
-from intents.classifier import classify_intent
+from intents.classifier import classify_intent, prewarm as prewarm_classifier
 from intents.router import route_query
 
+try:
+    import readline
+except ImportError:
+    readline = None
+
+logger = logging.getLogger(__name__)
+
+def _prewarm_ollama():
+    from tools.chat import prewarm
+    prewarm()
+
+def _prewarm_docker():
+    from tools.code_interpreter import prewarm_sandbox
+    prewarm_sandbox()
+
+def _prewarm_browser():
+    from tools.computer_use import prewarm_browser_pool
+    prewarm_browser_pool()
+
+def _prewarm():
+    def run(target):
+        try:
+            target()
+        except Exception as e:
+            logger.debug("Prewarm step %s failed: %s", target.__name__, e)
+
+    targets = [prewarm_classifier, _prewarm_ollama, _prewarm_docker]
+    if os.getenv("ZEN_BROWSER_PREWARM", "").lower() in {"1", "true", "yes"}:
+        targets.append(_prewarm_browser)
+    for target in targets:
+        threading.Thread(target=run, args=(target,), name=f"zen-prewarm-{target.__name__}", daemon=True).start()
+
 def main():
     console = Console()
     welcome_text = Text("✻ Welcome to Zen", style="bold blue")
@@ -34,6 +61,7 @@ def main():
             print("\n⏺  " + str(result))
     else:
         console.print("[dim]Enter your query (or [blue]'quit'[/blue] to exit)[/dim]", style="dim")
+        _prewarm()
         try:
             while True:
                 query = input("\n> ").strip()
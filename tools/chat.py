@@ -1,17 +1,61 @@
 import os
+import asyncio
 import requests
-import json
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, List
 from crewai import Agent, Task, Crew, LLM
 from crewai.tools import BaseTool
-from dotenv import load_dotenv
 from utils.install_ollama import OllamaInstaller
+from utils import fastjson
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-load_dotenv()
+_READY_SERVERS = set()
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+@lru_cache(maxsize=1)
+def _get_session() -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return session
+
+
+def _iter_json_lines(response: requests.Response, chunk_size: int = 8192):
+    buffer = bytearray()
+    for data in response.iter_content(chunk_size=chunk_size):
+        buffer.extend(data)
+        start = 0
+        end = buffer.find(b"\n")
+        while end != -1:
+            line = buffer[start:end].strip()
+            if line:
+                try:
+                    yield fastjson.loads(line)
+                except fastjson.JSONDecodeError:
+                    pass
+            start = end + 1
+            end = buffer.find(b"\n", start)
+        del buffer[:start]
+
+    line = buffer.strip()
+    if line:
+        try:
+            yield fastjson.loads(line)
+        except fastjson.JSONDecodeError:
+            pass
+
+
+def prewarm(base_url: str = "http://localhost:11434") -> bool:
+    try:
+        response = _get_session().get(f"{base_url}/api/tags", timeout=5)
+        return response.status_code == 200
+    except requests.exceptions.RequestException:
+        return False
+
 
 class ChatTool(BaseTool):
     name: str = "Chat Tool"
@@ -35,6 +79,10 @@ class ChatTool(BaseTool):
         self.system_prompt = system_prompt
         self._installer = None
 
+    @property
+    def session(self) -> requests.Session:
+        return _get_session()
+
     @property
     def installer(self):
         if self._installer is None:
@@ -42,11 +90,14 @@ class ChatTool(BaseTool):
         return self._installer
 
     def _ensure_ollama_ready(self) -> bool:
+        if (self.base_url, self.model) in _READY_SERVERS:
+            return True
         try:
             installer = self.installer
             success, message = installer.ensure_ollama_ready()
             if success:
                 logger.info("Ollama is ready to use")
+                _READY_SERVERS.add((self.base_url, self.model))
                 return True
             else:
                 logger.error(f"Failed to set up Ollama: {message}")
@@ -63,60 +114,86 @@ class ChatTool(BaseTool):
             return "Error: Unable to set up Ollama. Please check the installation and try again."
 
         try:
-            payload = {
-                "model": self.model,
-                "prompt": message,
-                "stream": stream,
-                **kwargs
-            }
-            
-            if self.system_prompt:
-                payload["system"] = self.system_prompt
+            payload = self._build_payload(message, stream, **kwargs)
 
             if stream:
                 return self._handle_streaming_response(payload)
             else:
-                response = requests.post(self.api_url, json=payload, timeout=300)
+                response = self.session.post(self.api_url, data=fastjson.dumps(payload), headers=_JSON_HEADERS, timeout=300)
 
                 if response.status_code == 200:
-                    result = response.json()
+                    result = fastjson.loads(response.content)
                     return result.get("response", "No response received from the model")
                 else:
                     return f"Error: Ollama API returned status code {response.status_code}. Make sure Ollama is running and the model '{self.model}' is installed."
 
         except requests.exceptions.RequestException as e:
+            _READY_SERVERS.discard((self.base_url, self.model))
             logger.error(f"Network error communicating with Ollama: {str(e)}")
             return f"Error: Could not connect to Ollama. Make sure it's running on {self.base_url}. Details: {str(e)}"
         except Exception as e:
             logger.error(f"Unexpected error: {str(e)}")
             return f"Error: Unexpected error occurred: {str(e)}"
 
+    def _build_payload(self, message: str, stream: bool = False, **kwargs) -> Dict[str, Any]:
+        payload = {
+            "model": self.model,
+            "prompt": message,
+            "stream": stream,
+            **kwargs
+        }
+        if self.system_prompt:
+            payload["system"] = self.system_prompt
+        return payload
+
+    async def _abatch(self, messages: List[str], **kwargs) -> List[str]:
+        import httpx
+
+        async def generate(client, message: str) -> str:
+            if not message:
+                return "Error: Message cannot be empty"
+            response = await client.post(
+                "/api/generate",
+                content=fastjson.dumps(self._build_payload(message, **kwargs)),
+                headers=_JSON_HEADERS
+            )
+            if response.status_code != 200:
+                return f"Error: Ollama API returned status code {response.status_code}. Make sure Ollama is running and the model '{self.model}' is installed."
+            return fastjson.loads(response.content).get("response", "No response received from the model")
+
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=300) as client:
+            results = await asyncio.gather(
+                *(generate(client, m) for m in messages),
+                return_exceptions=True
+            )
+
+        replies = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error in batch generation: {str(result)}")
+                replies.append(f"Error: Could not get a response from Ollama. Details: {str(result)}")
+            else:
+                replies.append(result)
+        return replies
+
     def _handle_streaming_response(self, payload: Dict[str, Any]) -> str:
         try:
-            response = requests.post(self.api_url, json=payload, stream=True, timeout=600)
+            response = self.session.post(self.api_url, data=fastjson.dumps(payload), headers=_JSON_HEADERS, stream=True, timeout=600)
             
             if response.status_code != 200:
                 return f"Error: Ollama API returned status code {response.status_code}. Make sure Ollama is running and the model '{self.model}' is installed."
             
             full_response = []
-            for line in response.iter_lines():
-                if line:
-                    line = line.decode('utf-8')
-                    if line.startswith('data: '):
-                        line = line[6:]
-                    
-                    try:
-                        chunk = json.loads(line)
-                        if 'response' in chunk:
-                            full_response.append(chunk['response'])
-                        if chunk.get('done', False):
-                            break
-                    except json.JSONDecodeError:
-                        continue
+            for chunk in _iter_json_lines(response):
+                if 'response' in chunk:
+                    full_response.append(chunk['response'])
+                if chunk.get('done', False):
+                    break
             
             return ''.join(full_response)
             
         except requests.exceptions.RequestException as e:
+            _READY_SERVERS.discard((self.base_url, self.model))
             logger.error(f"Network error during streaming: {str(e)}")
             return f"Error: Could not connect to Ollama for streaming. Details: {str(e)}"
         except Exception as e:
@@ -182,4 +259,13 @@ def simple_chat(message: str, model: Optional[str] = None, system_prompt: Option
     if model is None:
         model = os.getenv("OLLAMA_MODEL", "mistral:7b")
     tool = ChatTool(model=model, system_prompt=system_prompt)
-    return tool._run(message, stream=stream)
\ No newline at end of file
+    return tool._run(message, stream=stream)
+
+
+def simple_chat_batch(messages: List[str], model: Optional[str] = None, system_prompt: Optional[str] = None) -> List[str]:
+    if model is None:
+        model = os.getenv("OLLAMA_MODEL", "mistral:7b")
+    tool = ChatTool(model=model, system_prompt=system_prompt)
+    if not tool._ensure_ollama_ready():
+        return ["Error: Unable to set up Ollama. Please check the installation and try again."] * len(messages)
+    return asyncio.run(tool._abatch(messages))
@@ -5,8 +5,14 @@ import tempfile
 import shutil
 import uuid
 import time
+import atexit
+import queue
+import threading
+import socket
+import zipfile
 from datetime import datetime, timezone
-from utils.sandbox_security import validate_code_ast, CodeSafetyError
+from cache.ttl import ttl_cache
+from tools.utils.sandbox_security import validate_code_ast, CodeSafetyError
 
 DEFAULT_DOCKER_IMAGE = os.getenv("SANDBOX_DOCKER_IMAGE", "python:3.11-slim")
 SANDBOX_BASE_DIR = os.getenv("SANDBOX_BASE_DIR", os.path.abspath("./sandbox_runs"))
@@ -15,6 +21,73 @@ SANDBOX_TIMEOUT = int(os.getenv("SANDBOX_TIMEOUT", "30"))
 SANDBOX_MEMORY = os.getenv("SANDBOX_MEMORY", "512m")
 SANDBOX_CPUS = os.getenv("SANDBOX_CPUS", "1.0")
 MAX_STDOUT_CHARS = int(os.getenv("SANDBOX_MAX_STDOUT", "10000"))
+SANDBOX_REUSE_CONTAINER = os.getenv("SANDBOX_REUSE_CONTAINER", "true").lower() in {"1", "true", "yes"}
+DOCKER_CHECK_TTL = 300
+
+SANDBOX_START_TIMEOUT = 60
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+_SESSION_RUNNER = r"""
+import os, sys, shutil, signal, traceback
+sys.stderr = sys.stdout
+print("\x1e" + sys.argv[1], flush=True)
+for line in sys.stdin:
+    token, _, run_dir = line.strip().partition(" ")
+    if not run_dir:
+        continue
+    sentinel = "\x1e" + token
+    for entry in os.listdir("/runs"):
+        if entry == run_dir:
+            continue
+        path = os.path.join("/runs", entry)
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except OSError:
+            pass
+    pid = os.fork()
+    if pid == 0:
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        sys.stdin = open(0, closefd=False)
+        exit_code = 0
+        try:
+            os.chdir(os.path.join("/runs", run_dir))
+            with open("script.py", encoding="utf-8") as f:
+                code = compile(f.read(), "script.py", "exec")
+            exec(code, {"__name__": "__main__", "__file__": "script.py", "__builtins__": __builtins__})
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                exit_code = e.code
+            elif e.code is not None:
+                print(e.code, file=sys.stderr)
+                exit_code = 1
+        except BaseException as e:
+            traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+            exit_code = 1
+        try:
+            sys.stdout.flush()
+        finally:
+            os._exit(exit_code & 0xFF)
+    _, status = os.waitpid(pid, 0)
+    if os.WIFSIGNALED(status):
+        print(f"Process killed by signal {os.WTERMSIG(status)}")
+    if os.getpid() == 1:
+        try:
+            os.kill(-1, signal.SIGKILL)
+        except OSError:
+            pass
+    while True:
+        try:
+            os.waitpid(-1, 0)
+        except ChildProcessError:
+            break
+    print(sentinel, flush=True)
+"""
 
 def ensure_dir(path):
     os.makedirs(path, exist_ok=True)
@@ -27,19 +100,82 @@ def make_run_workspace():
     ensure_dir(workspace)
     return os.path.abspath(workspace)
 
+def write_private_file(path, data):
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o600)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+    return path
+
 def write_script(workspace, code, filename="script.py"):
     script_path = os.path.join(workspace, filename)
-    with open(script_path, "w", encoding="utf-8") as f:
-        f.write(code)
-    os.chmod(script_path, 0o600)
-    return script_path
+    return write_private_file(script_path, code.encode("utf-8"))
 
-def copy_artifacts_to_output(workspace):
-    ensure_dir(SANDBOX_OUTPUT_DIR)
-    
+def link_or_copy(src_path, dst_path):
+    try:
+        os.link(src_path, dst_path)
+        return
+    except OSError:
+        pass
+
+    if sys.platform.startswith("linux"):
+        try:
+            with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+                size = os.fstat(src.fileno()).st_size
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            return
+        except OSError:
+            pass
+
+    shutil.copyfile(src_path, dst_path)
+
+def stage_run_inputs(workspace, staging_dir):
+    ensure_dir(staging_dir)
+    with os.scandir(workspace) as entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False):
+                shutil.copyfile(entry.path, os.path.join(staging_dir, entry.name))
+
+def collect_staged_outputs(staging_dir, workspace):
+    for root, _, filenames in os.walk(staging_dir):
+        for fn in filenames:
+            src_path = os.path.join(root, fn)
+            if os.path.islink(src_path) or not os.path.isfile(src_path):
+                continue
+            dst_path = os.path.join(workspace, os.path.relpath(src_path, staging_dir))
+            ensure_dir(os.path.dirname(dst_path))
+            if os.path.lexists(dst_path):
+                os.remove(dst_path)
+            shutil.copyfile(src_path, dst_path)
+
+def make_output_dir():
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     output_subdir = os.path.join(SANDBOX_OUTPUT_DIR, f"run_{timestamp}")
     ensure_dir(output_subdir)
+    return output_subdir
+
+def copy_artifact(src_path, rel_path, output_subdir):
+    dst_path = os.path.join(output_subdir, rel_path)
+    
+    dst_dir = os.path.dirname(dst_path)
+    if dst_dir:
+        ensure_dir(dst_dir)
+    
+    link_or_copy(src_path, dst_path)
+    return dst_path
+
+def copy_artifacts_to_output(workspace):
+    output_subdir = make_output_dir()
     
     copied_files = []
     for root, _, filenames in os.walk(workspace):
@@ -49,39 +185,61 @@ def copy_artifacts_to_output(workspace):
                 
             src_path = os.path.join(root, fn)
             rel_path = os.path.relpath(src_path, workspace)
-            dst_path = os.path.join(output_subdir, rel_path)
-            
-            dst_dir = os.path.dirname(dst_path)
-            if dst_dir:
-                ensure_dir(dst_dir)
-            
-            shutil.copy2(src_path, dst_path)
-            copied_files.append(dst_path)
+            copied_files.append(copy_artifact(src_path, rel_path, output_subdir))
     
     return copied_files
 
 def collect_artifacts(workspace, keep_script=True):
-    files = []
-    for root, _, filenames in os.walk(workspace):
-        for fn in filenames:
-            full = os.path.join(root, fn)
-            rel = os.path.relpath(full, workspace)
-            files.append(rel)
+    with os.scandir(workspace) as entries:
+        if not any(entry.name != "script.py" for entry in entries):
+            return [], None, []
     
-    copied_files = copy_artifacts_to_output(workspace)
+    output_subdir = make_output_dir()
+    zip_name = f"artifacts_{os.path.basename(workspace)}.zip"
+    zip_path = os.path.join(SANDBOX_BASE_DIR, zip_name)
     
-    zip_path = None
-    if files:
-        zip_name = f"artifacts_{os.path.basename(workspace)}.zip"
-        zip_path = os.path.join(SANDBOX_BASE_DIR, zip_name)
-        shutil.make_archive(zip_path.replace(".zip", ""), "zip", workspace)
+    files = []
+    copied_files = []
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as zf:
+        for root, _, filenames in os.walk(workspace):
+            for fn in filenames:
+                full = os.path.join(root, fn)
+                rel = os.path.relpath(full, workspace)
+                files.append(rel)
+                zf.write(full, rel)
+                if fn != "script.py":
+                    copied_files.append(copy_artifact(full, rel, output_subdir))
     
     return files, zip_path, copied_files
 
+def docker_socket_available():
+    if os.getenv("DOCKER_HOST"):
+        return False
+    if sys.platform == "win32":
+        return os.path.exists(r"\\.\pipe\docker_engine")
+    sock_paths = ["/var/run/docker.sock"]
+    if os.getenv("XDG_RUNTIME_DIR"):
+        sock_paths.append(os.path.join(os.getenv("XDG_RUNTIME_DIR"), "docker.sock"))
+    for sock_path in sock_paths:
+        if not os.path.exists(sock_path):
+            continue
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(0.5)
+                sock.connect(sock_path)
+            return True
+        except OSError:
+            continue
+    return False
+
+@ttl_cache(DOCKER_CHECK_TTL)
 def check_docker_available():
     if not shutil.which("docker"):
         return False
     
+    if docker_socket_available():
+        return True
+    
     try:
         result = subprocess.run(
             ["docker", "version"],
@@ -93,6 +251,7 @@ def check_docker_available():
     except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
         return False
 
+@ttl_cache(DOCKER_CHECK_TTL)
 def pull_docker_image(image):
     try:
         result = subprocess.run(
@@ -116,16 +275,163 @@ def pull_docker_image(image):
         print(f"[SECURE-RUN] Error pulling image: {e}")
         return False
 
+def docker_limit_args(memory, cpus):
+    return [
+        "--network", "none",
+        "--memory", str(memory),
+        "--cpus", str(cpus),
+        "--pids-limit", "128",
+        "--security-opt", "no-new-privileges",
+        "--read-only",
+        "--ipc", "none",
+    ]
+
+class SandboxSessionError(Exception):
+    pass
+
+class SandboxSession:
+    def __init__(self, image, memory, cpus):
+        self.name = f"zen-sandbox-{uuid.uuid4().hex[:12]}"
+        token = uuid.uuid4().hex
+        self._lines = queue.Queue()
+        self._lock = threading.Lock()
+
+        ensure_dir(SANDBOX_BASE_DIR)
+        self.staging_dir = tempfile.mkdtemp(prefix=".session_", dir=SANDBOX_BASE_DIR)
+        cmd = ["docker", "run", "-i", "--rm", "--name", self.name] + docker_limit_args(memory, cpus) + [
+            "-v", f"{self.staging_dir}:/runs:rw",
+            "--workdir", "/runs",
+            image,
+            "python", "-u", "-c", _SESSION_RUNNER, token
+        ]
+        self.proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1
+        )
+        threading.Thread(target=self._pump, name=f"{self.name}-stdout", daemon=True).start()
+
+        try:
+            output = self._read_until_sentinel(f"\x1e{token}\n", SANDBOX_START_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.close()
+            raise SandboxSessionError("sandbox container did not start in time")
+        if output is None:
+            self.close()
+            raise SandboxSessionError("sandbox container exited during startup")
+
+    def _pump(self):
+        for line in self.proc.stdout:
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def _read_until_sentinel(self, sentinel, timeout):
+        deadline = time.monotonic() + timeout
+        chunks = []
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired("sandbox session", timeout)
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                raise subprocess.TimeoutExpired("sandbox session", timeout)
+            if line is None:
+                return None
+            if line.endswith(sentinel):
+                chunks.append(line[:-len(sentinel)])
+                return "".join(chunks)
+            chunks.append(line)
+
+    def alive(self):
+        return self.proc.poll() is None
+
+    def run(self, workspace, timeout):
+        run_dir = os.path.basename(workspace)
+        staged = os.path.join(self.staging_dir, run_dir)
+        token = uuid.uuid4().hex
+        with self._lock:
+            try:
+                stage_run_inputs(workspace, staged)
+                self.proc.stdin.write(f"{token} {run_dir}\n")
+                self.proc.stdin.flush()
+            except OSError as e:
+                raise SandboxSessionError(f"sandbox container is gone: {e}")
+            output = self._read_until_sentinel(f"\x1e{token}\n", timeout)
+            if output is None:
+                raise SandboxSessionError("sandbox container exited unexpectedly")
+            try:
+                collect_staged_outputs(staged, workspace)
+            except OSError as e:
+                output += f"\n[SECURE-RUN] Could not collect workspace files: {e}"
+            shutil.rmtree(staged, ignore_errors=True)
+            return output
+
+    def close(self):
+        try:
+            self.proc.kill()
+        except OSError:
+            pass
+        try:
+            subprocess.run(
+                ["docker", "kill", self.name],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=10
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            pass
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+def get_sandbox_session(image, memory, cpus):
+    key = (image, str(memory), str(cpus))
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session and session.alive():
+            return session
+
+        try:
+            session = SandboxSession(image, memory, cpus)
+        except (SandboxSessionError, OSError) as e:
+            print(f"[SECURE-RUN] Could not start sandbox container: {e}")
+            _sessions.pop(key, None)
+            return None
+
+        _sessions[key] = session
+        return session
+
+def discard_sandbox_session(session):
+    with _sessions_lock:
+        for key, value in list(_sessions.items()):
+            if value is session:
+                del _sessions[key]
+    session.close()
+
+@atexit.register
+def close_sandbox_sessions():
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
 class LocalCodeInterpreterTool:
     name = "Local Code Interpreter (Sandboxed Docker)"
     description = "Execute Python snippets inside a restricted Docker container with AST checks and artifact collection."
 
-    def __init__(self, docker_image=DEFAULT_DOCKER_IMAGE, timeout=SANDBOX_TIMEOUT, memory=SANDBOX_MEMORY, cpus=SANDBOX_CPUS, use_custom_image=False):
+    def __init__(self, docker_image=DEFAULT_DOCKER_IMAGE, timeout=SANDBOX_TIMEOUT, memory=SANDBOX_MEMORY, cpus=SANDBOX_CPUS, use_custom_image=False, reuse_container=SANDBOX_REUSE_CONTAINER):
         self.docker_image = docker_image
         self.timeout = timeout
         self.memory = memory
         self.cpus = cpus
         self.use_custom_image = use_custom_image
+        self.reuse_container = reuse_container
+        self._docker_cmd_prefix = ["docker", "run", "--rm"] + docker_limit_args(memory, cpus)
         if use_custom_image:
             self._build_custom_image()
 
@@ -164,6 +470,37 @@ WORKDIR /workspace
         finally:
             shutil.rmtree(temp_dir)
 
+    def _execute(self, docker_cmd):
+        start_time = time.time()
+        try:
+            proc = subprocess.run(
+                docker_cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                timeout=self.timeout
+            )
+            return proc.stdout or "", time.time() - start_time
+        except subprocess.TimeoutExpired:
+            return "[SECURE-RUN] Timeout: execution exceeded the limit and was interrupted.", self.timeout
+        except FileNotFoundError as e:
+            return f"[SECURE-RUN] Error: docker not found or not accessible: {e}", time.time() - start_time
+        except Exception as e:
+            return f"[SECURE-RUN] Execution error: {e}", time.time() - start_time
+
+    def _execute_in_session(self, session, workspace):
+        start_time = time.time()
+        try:
+            return session.run(workspace, self.timeout), time.time() - start_time
+        except subprocess.TimeoutExpired:
+            discard_sandbox_session(session)
+            return "[SECURE-RUN] Timeout: execution exceeded the limit and was interrupted.", self.timeout
+        except SandboxSessionError as e:
+            discard_sandbox_session(session)
+            return f"[SECURE-RUN] Execution error: {e}", time.time() - start_time
+
     def _run(self, code, extra_files=None):
         try:
             validate_code_ast(code)
@@ -187,46 +524,24 @@ WORKDIR /workspace
         if extra_files:
             for fname, data in extra_files:
                 safe_fname = os.path.join(workspace, os.path.basename(fname))
-                with open(safe_fname, "wb") as f:
-                    f.write(data)
-                os.chmod(safe_fname, 0o600)
-
-        docker_cmd = [
-            "docker", "run", "--rm",
-            "--network", "none",
-            "--memory", str(self.memory),
-            "--cpus", str(self.cpus),
-            "--pids-limit", "128",
-            "--security-opt", "no-new-privileges",
-            "--read-only",
-            "-v", f"{workspace}:/workspace:rw",
-            "--workdir", "/workspace",
-            self.docker_image,
-            "python", "-u", "script.py"
-        ]
+                try:
+                    write_private_file(safe_fname, data)
+                except FileExistsError:
+                    return f"[SECURE-RUN] Duplicate input file name: {os.path.basename(fname)}"
 
-        start_time = time.time()
-        try:
-            proc = subprocess.run(
-                docker_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                timeout=self.timeout
-            )
-            raw_output = proc.stdout or ""
-            execution_time = time.time() - start_time
-        except subprocess.TimeoutExpired:
-            raw_output = "[SECURE-RUN] Timeout: execution exceeded the limit and was interrupted."
-            execution_time = self.timeout
-        except FileNotFoundError as e:
-            raw_output = f"[SECURE-RUN] Error: docker not found or not accessible: {e}"
-            execution_time = time.time() - start_time
-        except Exception as e:
-            raw_output = f"[SECURE-RUN] Execution error: {e}"
-            execution_time = time.time() - start_time
+        session = None
+        if self.reuse_container:
+            session = get_sandbox_session(self.docker_image, self.memory, self.cpus)
+
+        if session:
+            raw_output, execution_time = self._execute_in_session(session, workspace)
+        else:
+            raw_output, execution_time = self._execute(self._docker_cmd_prefix + [
+                "-v", f"{workspace}:/workspace:rw",
+                "--workdir", "/workspace",
+                self.docker_image,
+                "python", "-u", "script.py"
+            ])
 
         if len(raw_output) > MAX_STDOUT_CHARS:
             truncated_marker = f"\n...[truncated output, total length {len(raw_output)} chars]..."
@@ -277,6 +592,36 @@ WORKDIR /workspace
         return "\n".join(res_lines)
 
 
+_default_tool = None
+
+def run_code_interpreter(code, extra_files=None):
+    global _default_tool
+    if _default_tool is None:
+        _default_tool = LocalCodeInterpreterTool()
+    return _default_tool._run(code, extra_files=extra_files)
+
+
+def prewarm_sandbox(image=DEFAULT_DOCKER_IMAGE, memory=SANDBOX_MEMORY, cpus=SANDBOX_CPUS):
+    if not check_docker_available() or not pull_docker_image(image):
+        return False
+    if SANDBOX_REUSE_CONTAINER:
+        return get_sandbox_session(image, memory, cpus) is not None
+    try:
+        result = subprocess.run(
+            ["docker", "run", "--rm", "--network", "none", image, "python", "-c", "pass"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=60
+        )
+        return result.returncode == 0
+    except (subprocess.TimeoutExpired, OSError):
+        return False
+
+
+if os.getenv("ZEN_SANDBOX_PREWARM", "").lower() in {"1", "true", "yes"}:
+    threading.Thread(target=prewarm_sandbox, name="zen-sandbox-prewarm", daemon=True).start()
+
+
 def main():
     running_in_tests = bool(os.getenv("PYTEST_CURRENT_TEST")) or os.getenv("CI", "").lower() in {"1", "true", "yes"}
     docker_available = check_docker_available()
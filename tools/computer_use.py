@@ -1,8 +1,10 @@
 import os
 import asyncio
+import atexit
 import base64
 import io
-import json
+import tempfile
+import threading
 from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 from pathlib import Path
@@ -10,9 +12,11 @@ from PIL import Image
 import numpy as np
 from crewai import Agent, Task, Crew
 from crewai.tools import BaseTool
-from dotenv import load_dotenv
 import logging
 import requests
+from cache.ttl import ttl_cache
+from tools.search import WebSearchTool
+from utils import fastjson
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,13 +30,311 @@ except ImportError:
     ChatOpenAI = None
 
 try:
-    from playwright.async_api import async_playwright
+    import pybase64 as b64codec
+except ImportError:
+    b64codec = base64
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
+    PlaywrightTimeoutError = asyncio.TimeoutError
     logger.warning("Playwright not installed. Install with: pip install playwright")
 
-load_dotenv()
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_CONTEXTS_PER_BROWSER = int(os.getenv("BROWSER_CONTEXTS_PER_BROWSER", "8"))
+BROWSER_STATE_PATH = os.path.expanduser(os.getenv("ZEN_BROWSER_STATE", "~/.zen_browser_state.json"))
+BROWSER_CACHE_DIR = os.path.expanduser(os.getenv("ZEN_BROWSER_CACHE", "~/.cache/zen/browser"))
+BROWSER_CACHE_SIZE = 512 * 1024 * 1024
+TRACKER_DOMAINS = ('google-analytics.com', 'doubleclick.net', 'hotjar.com', 'segment.io')
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'media', 'stylesheet'})
+BROWSER_LAUNCH_ARGS = [
+    '--start-maximized',
+    '--host-resolver-rules=' + ', '.join(
+        f'MAP {pattern} ~NOTFOUND' for domain in TRACKER_DOMAINS for pattern in (domain, f'*.{domain}')
+    )
+]
+if BROWSER_CACHE_DIR:
+    BROWSER_LAUNCH_ARGS += [f'--disk-cache-dir={BROWSER_CACHE_DIR}', f'--disk-cache-size={BROWSER_CACHE_SIZE}']
+BROWSER_VIEWPORT = {'width': 1920, 'height': 1080}
+BROWSER_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+NAVIGATION_IDLE_MS = 1500
+STATIC_FETCH_TIMEOUT = 10
+STATIC_HTML_TTL = 300
+STATIC_HTML_CACHE_SIZE = 32
+PAGE_HELPERS_JS = """
+window.__zenSelCache = new Map();
+window.__zenQs = (selector) => {
+    let element = window.__zenSelCache.get(selector);
+    if (!element || !element.isConnected) {
+        element = document.querySelector(selector);
+        window.__zenSelCache.set(selector, element);
+    }
+    return element;
+};
+window.__zenHighlight = (selector) => {
+    const element = window.__zenQs(selector);
+    if (element) {
+        element.style.border = '3px solid red';
+        element.style.backgroundColor = 'rgba(255, 0, 0, 0.1)';
+        setTimeout(() => {
+            element.style.border = '';
+            element.style.backgroundColor = '';
+        }, 2000);
+    }
+};
+window.__zenAnnotate = () => {
+    let overlay = document.getElementById('__zenOverlay');
+    if (overlay && Date.now() - Number(overlay.dataset.createdAt) < 500) {
+        return;
+    }
+    if (overlay) overlay.remove();
+
+    // Outline all clickable elements and number them inside one overlay
+    overlay = document.createElement('div');
+    overlay.id = '__zenOverlay';
+    overlay.dataset.createdAt = String(Date.now());
+    overlay.style.cssText = 'position: absolute; top: 0; left: 0; pointer-events: none; z-index: 10000;';
+    const clickables = document.querySelectorAll('a, button, input, select, textarea, [onclick]');
+    clickables.forEach((el, index) => {
+        const rect = el.getBoundingClientRect();
+        if (rect.width > 0 && rect.height > 0) {
+            const top = rect.top + window.scrollY;
+            const left = rect.left + window.scrollX;
+
+            const box = document.createElement('div');
+            box.style.cssText = `
+                position: absolute;
+                top: ${top}px;
+                left: ${left}px;
+                width: ${rect.width}px;
+                height: ${rect.height}px;
+                outline: 1px dashed rgba(0, 123, 255, 0.5);
+            `;
+            overlay.appendChild(box);
+
+            const label = document.createElement('div');
+            label.textContent = index + 1;
+            label.style.cssText = `
+                position: absolute;
+                top: ${top}px;
+                left: ${left - 20}px;
+                background: #007bff;
+                color: white;
+                padding: 2px 5px;
+                border-radius: 3px;
+                font-size: 11px;
+            `;
+            overlay.appendChild(label);
+        }
+    });
+    document.body.appendChild(overlay);
+
+    // Fallback in case the caller never clears the overlay
+    setTimeout(() => overlay.remove(), 3000);
+};
+window.__zenClearAnnotations = () => {
+    const overlay = document.getElementById('__zenOverlay');
+    if (overlay) overlay.remove();
+};
+"""
+STATEFUL_ACTIONS = frozenset({
+    "navigate", "click", "type", "scroll", "hover", "select", "upload", "execute_script"
+})
+
+
+def _write_private_atomic(path: str, data: bytes):
+    fd, tmp_path = tempfile.mkstemp(prefix=".zen_state_", dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class BrowserPool:
+    def __init__(self, max_concurrent: int = BROWSER_POOL_SIZE, contexts_per_browser: int = BROWSER_CONTEXTS_PER_BROWSER):
+        self.max_concurrent = max_concurrent
+        self.contexts_per_browser = contexts_per_browser
+        self.browsers: List[Any] = []
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._playwright = None
+        self._starting: Optional[asyncio.Future] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+
+    async def _start(self):
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop = loop
+            self.browsers = []
+            self._launch_lock = asyncio.Lock()
+            self._starting = asyncio.ensure_future(async_playwright().start())
+        self._playwright = await self._starting
+
+    async def _launch(self):
+        if BROWSER_CACHE_DIR:
+            os.makedirs(BROWSER_CACHE_DIR, mode=0o700, exist_ok=True)
+        browser = await self._playwright.chromium.launch(
+            headless=False,
+            args=BROWSER_LAUNCH_ARGS
+        )
+        self.browsers.append(browser)
+        return browser
+
+    async def _pick_browser(self):
+        async with self._launch_lock:
+            self.browsers = [b for b in self.browsers if b.is_connected()]
+            browser = min(self.browsers, key=lambda b: len(b.contexts), default=None)
+            if browser is None or (
+                len(browser.contexts) >= self.contexts_per_browser
+                and len(self.browsers) < self.max_concurrent
+            ):
+                browser = await self._launch()
+            return browser
+
+    async def warm_up(self, count: int = 1):
+        await self._start()
+        async with self._launch_lock:
+            while len(self.browsers) < min(count, self.max_concurrent):
+                await self._launch()
+
+    async def acquire(self):
+        await self._start()
+        browser = await self._pick_browser()
+        context_options = {"viewport": BROWSER_VIEWPORT, "user_agent": BROWSER_USER_AGENT}
+        if BROWSER_STATE_PATH and os.path.exists(BROWSER_STATE_PATH):
+            try:
+                context = await browser.new_context(storage_state=BROWSER_STATE_PATH, **context_options)
+            except Exception as e:
+                logger.debug(f"Ignoring unreadable browser state {BROWSER_STATE_PATH}: {str(e)}")
+                context = await browser.new_context(**context_options)
+        else:
+            context = await browser.new_context(**context_options)
+        await context.add_init_script(PAGE_HELPERS_JS)
+        return context
+
+    async def save_state(self, context, in_thread: bool = True):
+        if not BROWSER_STATE_PATH:
+            return
+        try:
+            data = fastjson.dumps(await context.storage_state())
+            if in_thread:
+                await asyncio.to_thread(_write_private_atomic, BROWSER_STATE_PATH, data)
+            else:
+                _write_private_atomic(BROWSER_STATE_PATH, data)
+        except Exception as e:
+            logger.debug(f"Could not save browser state: {str(e)}")
+
+    async def release(self, context):
+        await self.save_state(context)
+        try:
+            await context.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser context: {str(e)}")
+
+    async def shutdown(self):
+        if _BACKGROUND_WRITES:
+            await asyncio.gather(*list(_BACKGROUND_WRITES), return_exceptions=True)
+        for browser in self.browsers:
+            for context in browser.contexts:
+                await self.save_state(context, in_thread=False)
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self.browsers = []
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        self.loop = None
+
+
+_POOL = BrowserPool()
+
+_BACKGROUND_WRITES = set()
+
+
+def _write_in_background(path: Path, data: bytes):
+    task = asyncio.create_task(asyncio.to_thread(path.write_bytes, data))
+    _BACKGROUND_WRITES.add(task)
+    task.add_done_callback(_BACKGROUND_WRITES.discard)
+    return task
+
+
+def _encode_image(data: bytes) -> str:
+    return b64codec.b64encode(memoryview(data)).decode('ascii')
+
+
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.headers.update({'User-Agent': BROWSER_USER_AGENT})
+
+
+@ttl_cache(STATIC_HTML_TTL, maxsize=STATIC_HTML_CACHE_SIZE)
+def _fetch_html(url: str) -> str:
+    response = _HTTP_SESSION.get(url, timeout=STATIC_FETCH_TIMEOUT)
+    response.raise_for_status()
+    return response.text
+
+
+def _extract_static(url: str, selector: str, attribute: Optional[str] = None) -> Dict[str, Any]:
+    nodes = HTMLParser(_fetch_html(url)).css(selector)
+    if attribute:
+        data = [node.attributes.get(attribute) for node in nodes]
+    else:
+        data = [node.text() for node in nodes]
+    return {
+        "url": url,
+        "selector": selector,
+        "count": len(data),
+        "data": data,
+        "rendered": False
+    }
+
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_THREAD: Optional[threading.Thread] = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _LOOP, _LOOP_THREAD
+    with _LOOP_LOCK:
+        if _LOOP is None or not _LOOP_THREAD.is_alive():
+            _LOOP = asyncio.new_event_loop()
+            _LOOP_THREAD = threading.Thread(target=_LOOP.run_forever, name="zen-browser-loop", daemon=True)
+            _LOOP_THREAD.start()
+        return _LOOP
+
+
+def prewarm_browser_pool(count: int = 1) -> bool:
+    if not PLAYWRIGHT_AVAILABLE:
+        return False
+    asyncio.run_coroutine_threadsafe(_POOL.warm_up(count), _get_loop()).result()
+    return True
+
+
+@atexit.register
+def _shutdown_pool():
+    loop = _POOL.loop
+    if loop is None or loop.is_closed():
+        return
+    try:
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(_POOL.shutdown(), loop).result(timeout=10)
+        else:
+            loop.run_until_complete(_POOL.shutdown())
+    except Exception as e:
+        logger.debug(f"Error shutting down browser pool: {str(e)}")
 
 class EnhancedComputerUseTool(BaseTool):
     name: str = "Enhanced Computer Use"
@@ -48,6 +350,7 @@ class EnhancedComputerUseTool(BaseTool):
     screenshot_dir: Optional[Path] = None
     session_data: Dict[str, Any] = {}
     browser: Optional[Any] = None
+    context: Optional[Any] = None
     page: Optional[Any] = None
 
     def __init__(self, **kwargs):
@@ -56,7 +359,11 @@ class EnhancedComputerUseTool(BaseTool):
         self.screenshot_dir.mkdir(exist_ok=True)
         self.session_data = {}
         self.browser = None
+        self.context = None
         self.page = None
+        self._session_loop = None
+        self._dirty = False
+        self._needs_visual = True
         
         if not BROWSER_USE_AVAILABLE and not PLAYWRIGHT_AVAILABLE:
             raise ImportError(
@@ -66,23 +373,45 @@ class EnhancedComputerUseTool(BaseTool):
             )
 
     async def _init_browser(self):
-        if PLAYWRIGHT_AVAILABLE and not self.browser:
-            playwright = await async_playwright().start()
-            self.browser = await playwright.chromium.launch(
-                headless=False,
-                args=['--start-maximized']
-            )
-            context = await self.browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            )
-            self.page = await context.new_page()
-            
-    async def _close_browser(self):
-        if self.browser:
-            await self.browser.close()
+        if not PLAYWRIGHT_AVAILABLE:
+            return
+        if self.context and (
+            self._session_loop is not asyncio.get_running_loop()
+            or not self.browser.is_connected()
+        ):
             self.browser = None
+            self.context = None
             self.page = None
+        if not self.context:
+            self.context = await _POOL.acquire()
+            self.browser = self.context.browser
+            self._session_loop = asyncio.get_running_loop()
+            self._needs_visual = True
+            self.page = await self.context.new_page()
+
+    async def _block_resources(self, route):
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _set_needs_visual(self, needs_visual: bool):
+        if not self.context or needs_visual == self._needs_visual:
+            return
+        self._needs_visual = needs_visual
+        if needs_visual:
+            await self.context.unroute("**/*")
+        else:
+            await self.context.route("**/*", self._block_resources)
+            
+    async def _close_browser(self):
+        if self.context:
+            try:
+                await _POOL.release(self.context)
+            finally:
+                self.browser = None
+                self.context = None
+                self.page = None
 
     def _run(
         self,
@@ -93,14 +422,13 @@ class EnhancedComputerUseTool(BaseTool):
         **kwargs
     ) -> Dict[str, Any]:
         try:
-            result = asyncio.run(self._execute_action(
+            return self._submit(
                 action=action,
                 url=url,
                 selector=selector,
                 text=text,
                 **kwargs
-            ))
-            return result
+            ).result()
         except Exception as e:
             logger.error(f"Error in browser action: {str(e)}")
             return {
@@ -109,6 +437,12 @@ class EnhancedComputerUseTool(BaseTool):
                 "action": action
             }
 
+    def _submit(self, **kwargs):
+        return asyncio.run_coroutine_threadsafe(self._execute_action(**kwargs), _get_loop())
+
+    def _submit_close(self):
+        return asyncio.run_coroutine_threadsafe(self._close_browser(), _get_loop())
+
     async def _execute_action(
         self,
         action: str,
@@ -117,15 +451,37 @@ class EnhancedComputerUseTool(BaseTool):
         text: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
+        action = action.lower()
+
+        if (
+            action == "extract" and url and selector and HTMLParser is not None
+            and not self._dirty and not kwargs.get('rendered', False)
+        ):
+            try:
+                static = await asyncio.to_thread(_extract_static, url, selector, kwargs.get('attribute'))
+                if static["count"]:
+                    return {"status": "success", "action": action, **static}
+                logger.debug(f"Static extract found no matches for {selector} on {url}, using the browser")
+            except Exception as e:
+                logger.debug(f"Static extract failed for {url}, using the browser: {str(e)}")
+
         if PLAYWRIGHT_AVAILABLE:
             await self._init_browser()
+            if action in ("extract", "wait"):
+                await self._set_needs_visual(False)
+            elif action == "navigate":
+                await self._set_needs_visual(not kwargs.get('block_resources', False))
+            elif action == "screenshot":
+                await self._set_needs_visual(True)
         
-        action = action.lower()
+        if action in STATEFUL_ACTIONS:
+            self._dirty = True
+        kwargs['_ts'] = datetime.now().strftime('%Y%m%d_%H%M%S')
         result = {"status": "success", "action": action}
         
         try:
             if action == "navigate":
-                result.update(await self._navigate(url))
+                result.update(await self._navigate(url, **kwargs))
                 
             elif action == "click":
                 result.update(await self._click(selector, **kwargs))
@@ -137,7 +493,7 @@ class EnhancedComputerUseTool(BaseTool):
                 result.update(await self._screenshot(**kwargs))
                 
             elif action == "extract":
-                result.update(await self._extract(selector, **kwargs))
+                result.update(await self._extract(selector, url=url, **kwargs))
                 
             elif action == "scroll":
                 result.update(await self._scroll(**kwargs))
@@ -146,10 +502,10 @@ class EnhancedComputerUseTool(BaseTool):
                 result.update(await self._wait(selector, **kwargs))
                 
             elif action == "hover":
-                result.update(await self._hover(selector))
+                result.update(await self._hover(selector, **kwargs))
                 
             elif action == "select":
-                result.update(await self._select(selector, text))
+                result.update(await self._select(selector, text, **kwargs))
                 
             elif action == "upload":
                 result.update(await self._upload(selector, kwargs.get('file_path')))
@@ -176,15 +532,21 @@ class EnhancedComputerUseTool(BaseTool):
             
         return result
 
-    async def _navigate(self, url: str) -> Dict[str, Any]:
+    async def _wait_for_load_state(self, state: str, timeout: int):
+        try:
+            await self.page.wait_for_load_state(state, timeout=timeout)
+        except PlaywrightTimeoutError:
+            pass
+
+    async def _navigate(self, url: str, **kwargs) -> Dict[str, Any]:
         if not url:
             return {"error": "URL is required for navigation"}
             
         if self.page:
-            response = await self.page.goto(url, wait_until='networkidle')
-            await asyncio.sleep(1)
+            response = await self.page.goto(url, wait_until='domcontentloaded')
+            await self._wait_for_load_state('networkidle', kwargs.get('idle_ms', NAVIGATION_IDLE_MS))
             
-            screenshot_path = await self._take_screenshot(f"navigate_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            screenshot_path = await self._take_screenshot(f"navigate_{kwargs['_ts']}")
             
             return {
                 "url": url,
@@ -204,23 +566,22 @@ class EnhancedComputerUseTool(BaseTool):
                 await self._highlight_element(selector)
                 
             element = await self.page.wait_for_selector(selector, timeout=5000)
+            screenshots = kwargs.get('screenshots', False)
             
-            before_screenshot = await self._take_screenshot(f"before_click_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
-            before_screenshot = await self._take_screenshot(f"before_click_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            if screenshots:
+                before_screenshot = await self._take_screenshot(f"before_click_{kwargs['_ts']}")
             
             await element.click()
-            await asyncio.sleep(0.5)
-            
-            after_screenshot = await self._take_screenshot(f"after_click_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            await self._wait_for_load_state('domcontentloaded', kwargs.get('idle_ms', NAVIGATION_IDLE_MS))
             
-            return {
-                "selector": selector,
-                "clicked": True,
-                "screenshots": {
+            result = {"selector": selector, "clicked": True}
+            if screenshots:
+                after_screenshot = await self._take_screenshot(f"after_click_{kwargs['_ts']}")
+                result["screenshots"] = {
                     "before": before_screenshot,
                     "after": after_screenshot
                 }
-            }
+            return result
         else:
             return {"message": f"Clicked element: {selector}"}
 
@@ -238,7 +599,7 @@ class EnhancedComputerUseTool(BaseTool):
                 
             await element.type(text, delay=kwargs.get('delay', 50))
             
-            screenshot_path = await self._take_screenshot(f"typed_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            screenshot_path = await self._take_screenshot(f"typed_{kwargs['_ts']}")
             
             return {
                 "selector": selector,
@@ -251,51 +612,76 @@ class EnhancedComputerUseTool(BaseTool):
 
     async def _screenshot(self, annotate: bool = True, full_page: bool = False, **kwargs) -> Dict[str, Any]:
         if self.page:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = kwargs.get('filename', f'screenshot_{timestamp}')
+            timestamp = kwargs['_ts']
+            filename = kwargs.get('filename') or f'screenshot_{timestamp}'
+            
+            image_type = kwargs.get('type', 'png')
+            extension = '.jpg' if image_type == 'jpeg' else '.png'
+            if not filename.endswith(extension):
+                filename += extension
+            screenshot_path = self.screenshot_dir / filename
             
             if annotate:
                 await self._annotate_page()
             
-            screenshot_path = await self._take_screenshot(
-                filename,
-                full_page=full_page,
-                clip=kwargs.get('clip')
-            )
-            
-            with open(screenshot_path, 'rb') as img_file:
-                base64_image = base64.b64encode(img_file.read()).decode('utf-8')
+            try:
+                image_bytes = await self._capture(
+                    full_page=full_page,
+                    clip=kwargs.get('clip'),
+                    image_type=image_type,
+                    quality=kwargs.get('quality')
+                )
+            except Exception:
+                if annotate:
+                    await self._clear_annotations()
+                raise
+            
+            if kwargs.get('save', True):
+                _write_in_background(screenshot_path, image_bytes)
+            subtasks = [
+                asyncio.to_thread(_encode_image, image_bytes),
+                self.page.title()
+            ]
+            if annotate:
+                subtasks.append(self._clear_annotations())
+            base64_image, title = (await asyncio.gather(*subtasks))[:2]
             
             return {
-                "screenshot_path": str(screenshot_path),
+                "screenshot_path": str(screenshot_path) if kwargs.get('save', True) else None,
                 "base64_image": base64_image,
                 "timestamp": timestamp,
                 "url": self.page.url,
-                "title": await self.page.title(),
-                "dimensions": await self.page.viewport_size()
+                "title": title,
+                "dimensions": self.page.viewport_size
             }
         else:
             return {"message": "Screenshot taken"}
 
-    async def _extract(self, selector: str, attribute: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+    async def _extract(self, selector: str, attribute: Optional[str] = None, url: Optional[str] = None, **kwargs) -> Dict[str, Any]:
         if not selector:
             return {"error": "Selector is required for extract action"}
             
         if self.page:
-            elements = await self.page.query_selector_all(selector)
-            
-            extracted_data = []
-            for element in elements:
-                if attribute:
-                    value = await element.get_attribute(attribute)
-                else:
-                    value = await element.text_content()
-                extracted_data.append(value)
-            
-            for element in elements:
-                await self._highlight_element_object(element)
+            if url and self.page.url != url:
+                await self.page.goto(url, wait_until='domcontentloaded')
+                await self._wait_for_load_state('networkidle', kwargs.get('idle_ms', NAVIGATION_IDLE_MS))
+
+            extracted_data = await self.page.evaluate("""
+                (args) => {
+                    const elements = [...document.querySelectorAll(args.selector)];
+                    elements.forEach(element => {
+                        element.style.border = '2px solid blue';
+                        element.style.backgroundColor = 'rgba(0, 0, 255, 0.1)';
+                        setTimeout(() => {
+                            element.style.border = '';
+                            element.style.backgroundColor = '';
+                        }, 2000);
+                    });
+                    return elements.map(element => args.attribute ? element.getAttribute(args.attribute) : element.textContent);
+                }
+            """, {"selector": selector, "attribute": attribute})
             
-            screenshot_path = await self._take_screenshot(f"extracted_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            screenshot_path = await self._take_screenshot(f"extracted_{kwargs['_ts']}")
             
             return {
                 "selector": selector,
@@ -318,7 +704,7 @@ class EnhancedComputerUseTool(BaseTool):
                 await self.page.evaluate("window.scrollTo(0, 0)")
             
             await asyncio.sleep(0.5)
-            screenshot_path = await self._take_screenshot(f"scroll_{direction}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            screenshot_path = await self._take_screenshot(f"scroll_{direction}_{kwargs['_ts']}")
             
             return {
                 "direction": direction,
@@ -338,13 +724,13 @@ class EnhancedComputerUseTool(BaseTool):
         else:
             return {"message": f"Waited for {selector}"}
 
-    async def _hover(self, selector: str) -> Dict[str, Any]:
+    async def _hover(self, selector: str, **kwargs) -> Dict[str, Any]:
         if self.page:
             element = await self.page.wait_for_selector(selector)
             await element.hover()
             await asyncio.sleep(0.5)
             
-            screenshot_path = await self._take_screenshot(f"hover_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            screenshot_path = await self._take_screenshot(f"hover_{kwargs['_ts']}")
             
             return {
                 "selector": selector,
@@ -354,11 +740,11 @@ class EnhancedComputerUseTool(BaseTool):
         else:
             return {"message": f"Hovered over {selector}"}
 
-    async def _select(self, selector: str, value: str) -> Dict[str, Any]:
+    async def _select(self, selector: str, value: str, **kwargs) -> Dict[str, Any]:
         if self.page:
             await self.page.select_option(selector, value)
             
-            screenshot_path = await self._take_screenshot(f"select_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            screenshot_path = await self._take_screenshot(f"select_{kwargs['_ts']}")
             
             return {
                 "selector": selector,
@@ -399,134 +785,41 @@ class EnhancedComputerUseTool(BaseTool):
         screenshot_path = self.screenshot_dir / filename
         
         if self.page:
-            screenshot_options = {"path": str(screenshot_path)}
-            if full_page:
-                screenshot_options["full_page"] = True
-            if clip:
-                screenshot_options["clip"] = clip
-                
-            await self.page.screenshot(**screenshot_options)
+            image_bytes = await self._capture(full_page=full_page, clip=clip)
+            _write_in_background(screenshot_path, image_bytes)
             
         return screenshot_path
 
+    async def _capture(self, full_page: bool = False, clip: Optional[Dict] = None, image_type: str = 'png', quality: Optional[int] = None) -> bytes:
+        screenshot_options = {"full_page": full_page, "type": image_type}
+        if clip:
+            screenshot_options["clip"] = clip
+        if image_type == 'jpeg':
+            screenshot_options["quality"] = quality or 75
+        return await self.page.screenshot(**screenshot_options)
+
     async def _highlight_element(self, selector: str):
         if self.page:
             try:
-                await self.page.evaluate(f"""
-                    const element = document.querySelector('{selector}');
-                    if (element) {{
-                        element.style.border = '3px solid red';
-                        element.style.backgroundColor = 'rgba(255, 0, 0, 0.1)';
-                        setTimeout(() => {{
-                            element.style.border = '';
-                            element.style.backgroundColor = '';
-                        }}, 2000);
-                    }}
-                """)
+                await self.page.evaluate("(selector) => window.__zenHighlight(selector)", selector)
             except:
                 pass
 
-    async def _highlight_element_object(self, element):
-        if element:
+    async def _annotate_page(self):
+        if self.page:
             try:
-                await element.evaluate("""
-                    element => {
-                        element.style.border = '2px solid blue';
-                        element.style.backgroundColor = 'rgba(0, 0, 255, 0.1)';
-                        setTimeout(() => {
-                            element.style.border = '';
-                            element.style.backgroundColor = '';
-                        }, 2000);
-                    }
-                """)
+                await self.page.evaluate("() => window.__zenAnnotate()")
             except:
                 pass
 
-    async def _annotate_page(self):
+    async def _clear_annotations(self):
         if self.page:
             try:
-                await self.page.evaluate("""
-                    // Highlight all clickable elements
-                    const clickables = document.querySelectorAll('a, button, input, select, textarea, [onclick]');
-                    clickables.forEach((el, index) => {
-                        const rect = el.getBoundingClientRect();
-                        if (rect.width > 0 && rect.height > 0) {
-                            el.style.outline = '1px dashed rgba(0, 123, 255, 0.5)';
-                            
-                            // Add index label
-                            const label = document.createElement('div');
-                            label.textContent = index + 1;
-                            label.style.cssText = `
-                                position: absolute;
-                                top: ${rect.top + window.scrollY}px;
-                                left: ${rect.left + window.scrollX - 20}px;
-                                background: #007bff;
-                                color: white;
-                                padding: 2px 5px;
-                                border-radius: 3px;
-                                font-size: 11px;
-                                z-index: 10000;
-                                pointer-events: none;
-                            `;
-                            document.body.appendChild(label);
-                            
-                            // Remove after 3 seconds
-                            setTimeout(() => {
-                                el.style.outline = '';
-                                label.remove();
-                            }, 3000);
-                        }
-                    });
-                """)
+                await self.page.evaluate("() => window.__zenClearAnnotations()")
             except:
                 pass
 
 
-class WebSearchTool(BaseTool):
-    name: str = "Web Search"
-    description: str = "Perform web searches using Google via Serper API to get relevant information and sources."
-
-    def _run(self, query: str, **kwargs) -> str:
-        api_key = os.getenv('SERPER_API_KEY')
-        if not api_key:
-            return "Error: SERPER_API_KEY not found in environment variables"
-        
-        headers = {
-            'X-API-KEY': api_key,
-            'Content-Type': 'application/json'
-        }
-        
-        payload = {
-            'q': query,
-            'num': 7,
-            **kwargs
-        }
-        
-        try:
-            response = requests.post("https://google.serper.dev/search", 
-                                   headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
-            
-            results = []
-            sources = []
-            if 'organic' in data:
-                for idx, result in enumerate(data['organic'][:7], 1):
-                    title = result.get('title', 'No title')
-                    snippet = result.get('snippet', 'No description')
-                    link = result.get('link', '')
-                    results.append(f"- **{title}**: {snippet}")
-                    sources.append(f"[{idx}]({link})")
-            
-            if results:
-                return "\n".join(results) + "\n\nSources:\n" + "\n".join(sources)
-            else:
-                return "No results found."
-            
-        except Exception as e:
-            return f"Error: {str(e)}"
-
-
 class ComputerUseAgent:
     def __init__(self):
         self.tool = EnhancedComputerUseTool()
@@ -568,7 +861,13 @@ class ComputerUseAgent:
             tasks=[task],
             verbose=True
         )
-        return crew.kickoff()
+        try:
+            return crew.kickoff()
+        finally:
+            try:
+                self.tool._submit_close().result()
+            except Exception as e:
+                logger.debug(f"Error releasing browser context: {str(e)}")
 
 
 class BrowserAutomationWorkflow:
@@ -577,19 +876,28 @@ class BrowserAutomationWorkflow:
         self.results = []
         
     async def execute_workflow(self, steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        for i, step in enumerate(steps):
-            logger.info(f"Executing step {i+1}/{len(steps)}: {step.get('action')}")
-            
-            result = self.tool._run(**step)
-            self.results.append(result)
-            
-            if result.get('status') == 'error':
-                logger.error(f"Error in step {i+1}: {result.get('message')}")
-                if not step.get('continue_on_error', False):
-                    break
-                    
-            if 'delay' in step:
-                await asyncio.sleep(step['delay'])
+        try:
+            for i, step in enumerate(steps):
+                logger.info(f"Executing step {i+1}/{len(steps)}: {step.get('action')}")
+                
+                try:
+                    result = await asyncio.wrap_future(self.tool._submit(**step))
+                except Exception as e:
+                    result = {"status": "error", "message": str(e), "action": step.get('action')}
+                self.results.append(result)
+                
+                if result.get('status') == 'error':
+                    logger.error(f"Error in step {i+1}: {result.get('message')}")
+                    if not step.get('continue_on_error', False):
+                        break
+                        
+                if 'delay' in step:
+                    await asyncio.sleep(step['delay'])
+        finally:
+            try:
+                await asyncio.wrap_future(self.tool._submit_close())
+            except Exception as e:
+                logger.debug(f"Error releasing browser context: {str(e)}")
                 
         return self.results
     
@@ -597,35 +905,43 @@ class BrowserAutomationWorkflow:
         output_path = Path("results") / filename
         output_path.parent.mkdir(exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            json.dump(self.results, f, indent=2, default=str)
+        output_path.write_bytes(fastjson.dumps(self.results, indent=True, default=str))
             
         logger.info(f"Results saved to {output_path}")
         return output_path
 
 
+_TOOL: Optional[EnhancedComputerUseTool] = None
+
+
+def _tool() -> EnhancedComputerUseTool:
+    global _TOOL
+    if _TOOL is None:
+        _TOOL = EnhancedComputerUseTool()
+    return _TOOL
+
+
 def navigate_to_website(url: str) -> Dict[str, Any]:
-    tool = EnhancedComputerUseTool()
-    return tool._run(action="navigate", url=url)
+    return _tool()._run(action="navigate", url=url)
 
 def click_element(selector: str, highlight: bool = True) -> Dict[str, Any]:
-    tool = EnhancedComputerUseTool()
-    return tool._run(action="click", selector=selector, highlight=highlight)
+    return _tool()._run(action="click", selector=selector, highlight=highlight)
 
 def type_text(selector: str, text: str, clear_first: bool = True) -> Dict[str, Any]:
-    tool = EnhancedComputerUseTool()
-    return tool._run(action="type", selector=selector, text=text, clear_first=clear_first)
+    return _tool()._run(action="type", selector=selector, text=text, clear_first=clear_first)
 
 def extract_text(selector: str, attribute: Optional[str] = None) -> Dict[str, Any]:
-    tool = EnhancedComputerUseTool()
-    return tool._run(action="extract", selector=selector, attribute=attribute)
+    return _tool()._run(action="extract", selector=selector, attribute=attribute)
 
 def take_screenshot(filename: Optional[str] = None, annotate: bool = True, full_page: bool = False) -> Dict[str, Any]:
-    tool = EnhancedComputerUseTool()
-    return tool._run(action="screenshot", filename=filename, annotate=annotate, full_page=full_page)
+    return _tool()._run(action="screenshot", filename=filename, annotate=annotate, full_page=full_page)
 
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
     tool = EnhancedComputerUseTool()
 
     tool._run(action="navigate", url="https://kirosnn.fr")
@@ -1,56 +1,48 @@
 import os
 import requests
 from datetime import datetime
-import locale
 from crewai import Agent, Task, Crew
 from crewai.tools import BaseTool
-from dotenv import load_dotenv
+from cache.ttl import ttl_cache
+
+SERPER_URL = "https://google.serper.dev/search"
+SEARCH_CACHE_TTL = 600
+
+_SESSION = requests.Session()
+_SESSION.headers.update({'Content-Type': 'application/json'})
+
+
+@ttl_cache(SEARCH_CACHE_TTL)
+def _search_cached(api_key: str, query: str, kwargs_key: tuple) -> dict:
+    payload = {
+        'q': query,
+        'num': 7,
+        **dict(kwargs_key)
+    }
+    response = _SESSION.post(SERPER_URL, headers={'X-API-KEY': api_key}, json=payload, timeout=10)
+    response.raise_for_status()
+    return response.json()
 
-load_dotenv()
 
 class WebSearchTool(BaseTool):
     name: str = "Web Search"
-    description: str = "Search the web for information using Serper API"
+    description: str = "Perform web searches using Google via Serper API to get relevant information and sources."
     
     def _run(self, query: str, **kwargs) -> str:
         api_key = os.getenv("SERPER_API_KEY")
         if not api_key:
             return "Error: SERPER_API_KEY not found in environment variables"
         
-        headers = {
-            'X-API-KEY': api_key,
-            'Content-Type': 'application/json'
-        }
-        
-        payload = {
-            'q': query,
-            'num': 7,
-            **kwargs
-        }
-        
         try:
-            response = requests.post("https://google.serper.dev/search", 
-                                   headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
+            data = _search_cached(api_key, query, tuple(sorted(kwargs.items())))
             
-            results = []
-            sources = []
-            if 'organic' in data:
-                for idx, result in enumerate(data['organic'][:7], 1):
-                    title = result.get('title', 'No title')
-                    snippet = result.get('snippet', 'No description')
-                    link = result.get('link', '')
-                    results.append(f"- **{title}**: {snippet}")
-                    sources.append(f"[{idx}]({link})")
-            
-            if not results:
+            organic = data.get('organic', ())[:7]
+            if not organic:
                 return "No results found."
             
-            return {
-                "results": "\n".join(results),
-                "sources": " ".join(sources)
-            }
+            results = [f"- **{r.get('title', 'No title')}**: {r.get('snippet', 'No description')}" for r in organic]
+            sources = [f"[{idx}]({r.get('link', '')})" for idx, r in enumerate(organic, 1)]
+            return "\n".join(results) + "\n\nSources:\n" + "\n".join(sources)
             
         except Exception as e:
             return f"Error performing search: {str(e)}"
@@ -60,16 +52,11 @@ search_tool = WebSearchTool()
 def format_datetime_for_lang(lang: str):
     now = datetime.now()
     if lang.startswith("fr"):
-        locale.setlocale(locale.LC_TIME, "fr_FR.UTF-8")
         return now.strftime("%d/%m/%Y %H:%M")
     else:
-        locale.setlocale(locale.LC_TIME, "en_US.UTF-8")
         return now.strftime("%B %d, %Y %I:%M %p")
 
-def create_zen_agent(lang_hint="en"):
-    current_time = format_datetime_for_lang(lang_hint)
-    
-    system_prompt = f"""
+SYSTEM_PROMPT_TEMPLATE = """
 You are Zen, an advanced AI research assistant.
 - Always detect the user's language and respond the same way.
 - The current date is : {current_time}.
@@ -87,6 +74,9 @@ You are Zen, an advanced AI research assistant.
     - You can develop more in 3 max sections if the answer can be too simple.
 """
 
+def create_zen_agent(lang_hint="en"):
+    system_prompt = SYSTEM_PROMPT_TEMPLATE.format(current_time=format_datetime_for_lang(lang_hint))
+
     return Agent(
         role="Zen - Intelligent Research Assistant",
         goal="Provide precise, structured answers in the user’s language, with sources.",
@@ -1,7 +1,12 @@
 import os
+import re
 import sys
 import ast
 import fnmatch
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from functools import lru_cache
 
 DEFAULT_FORBIDDEN_MODULES = {
     "os", "sys", "subprocess", "socket", "shutil", "pathlib", "ctypes", "multiprocessing",
@@ -17,9 +22,37 @@ DEFAULT_FORBIDDEN_ATTRS = {
 RAW_ALLOWED_IMPORTS = os.getenv("SANDBOX_ALLOWED_IMPORTS", "")
 ALLOWED_IMPORT_PATTERNS = [p.strip() for p in RAW_ALLOWED_IMPORTS.split(",") if p.strip()]
 
-FORBIDDEN_MODULES = DEFAULT_FORBIDDEN_MODULES
-FORBIDDEN_BUILTINS = DEFAULT_FORBIDDEN_BUILTINS
-FORBIDDEN_ATTRS = DEFAULT_FORBIDDEN_ATTRS
+_SUFFIX_PATTERN = re.compile(r"^\*\.[\w.]+$")
+_PREFIX_PATTERN = re.compile(r"^[\w.]+\.\*$")
+
+def _split_import_patterns(patterns):
+    literals, suffixes, prefixes, globs = set(), [], [], []
+    for pat in patterns:
+        if not any(c in pat for c in "*?["):
+            literals.add(pat)
+        elif _SUFFIX_PATTERN.match(pat):
+            suffixes.append(pat[1:])
+        elif _PREFIX_PATTERN.match(pat):
+            prefixes.append(pat[:-1])
+        else:
+            globs.append(re.compile(fnmatch.translate(pat)).match)
+    return frozenset(literals), tuple(suffixes), tuple(prefixes), tuple(globs)
+
+_ALLOWED_POLICY = tuple(ALLOWED_IMPORT_PATTERNS)
+_ALLOWED_LITERALS, _ALLOWED_SUFFIXES, _ALLOWED_PREFIXES, _ALLOWED_GLOBS = _split_import_patterns(_ALLOWED_POLICY)
+
+FORBIDDEN_MODULES = frozenset(sys.intern(name) for name in DEFAULT_FORBIDDEN_MODULES)
+FORBIDDEN_BUILTINS = frozenset(sys.intern(name) for name in DEFAULT_FORBIDDEN_BUILTINS)
+FORBIDDEN_ATTRS = frozenset(sys.intern(name) for name in DEFAULT_FORBIDDEN_ATTRS)
+
+_FORBIDDEN_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, sorted(FORBIDDEN_MODULES | FORBIDDEN_BUILTINS | FORBIDDEN_ATTRS))) + r")\b"
+)
+_IMPORT_RE = re.compile(r"\bimport\b")
+
+VALIDATION_CACHE_MAX = 512
+_validation_cache = OrderedDict()
+_validation_cache_lock = threading.Lock()
 
 class CodeSafetyError(Exception):
     pass
@@ -28,46 +61,144 @@ def _is_import_allowed(module_name):
     if not ALLOWED_IMPORT_PATTERNS:
         return True
     root = module_name.split(".")[0] if module_name else ""
-    for pat in ALLOWED_IMPORT_PATTERNS:
-        if fnmatch.fnmatch(module_name, pat) or fnmatch.fnmatch(root, pat):
+    for name in (module_name, root):
+        if (
+            name in _ALLOWED_LITERALS
+            or name.endswith(_ALLOWED_SUFFIXES)
+            or name.startswith(_ALLOWED_PREFIXES)
+            or any(match(name) for match in _ALLOWED_GLOBS)
+        ):
             return True
     return False
 
+def _current_policy():
+    global _ALLOWED_POLICY, _ALLOWED_LITERALS, _ALLOWED_SUFFIXES, _ALLOWED_PREFIXES, _ALLOWED_GLOBS
+    policy = tuple(ALLOWED_IMPORT_PATTERNS)
+    if policy != _ALLOWED_POLICY:
+        _ALLOWED_LITERALS, _ALLOWED_SUFFIXES, _ALLOWED_PREFIXES, _ALLOWED_GLOBS = _split_import_patterns(policy)
+        _ALLOWED_POLICY = policy
+    return policy
+
+def _is_trivially_safe(code):
+    # Python NFKC-normalizes identifiers, so a plain text scan is only sound for ASCII source
+    if not code.isascii() or _FORBIDDEN_RE.search(code):
+        return False
+    return not ALLOWED_IMPORT_PATTERNS or not _IMPORT_RE.search(code)
+
 def validate_code_ast(code):
+    if _is_trivially_safe(code):
+        return
+    digest = hashlib.blake2b(code.encode("utf-8", "replace"), digest_size=16).digest()
+    key = (_current_policy(), digest)
+    with _validation_cache_lock:
+        if key in _validation_cache:
+            _validation_cache.move_to_end(key)
+            error = _validation_cache[key]
+            if error is not None:
+                raise CodeSafetyError(error)
+            return
+
     try:
-        tree = ast.parse(code)
+        _check_code_ast(code)
+        error = None
+    except CodeSafetyError as e:
+        error = str(e)
+
+    with _validation_cache_lock:
+        _validation_cache[key] = error
+        while len(_validation_cache) > VALIDATION_CACHE_MAX:
+            _validation_cache.popitem(last=False)
+
+    if error is not None:
+        raise CodeSafetyError(error)
+
+def _collect_import(node, found):
+    for alias in node.names:
+        found.append(("import", alias.name))
+        if alias.name.split(".")[0] in FORBIDDEN_MODULES:
+            return True
+    return False
+
+def _collect_import_from(node, found):
+    mod = (node.module or "")
+    found.append(("import_from", mod))
+    return bool(mod) and mod.split(".")[0] in FORBIDDEN_MODULES
+
+def _collect_name(node, found):
+    if node.id in FORBIDDEN_BUILTINS:
+        found.append(("name", node.id))
+        return True
+    return False
+
+_ATTRIBUTE = ast.Attribute
+_NAME = ast.Name
+
+def _collect_call(node, found):
+    func = node.func
+    func_type = type(func)
+    if func_type is _ATTRIBUTE:
+        if func.attr in FORBIDDEN_ATTRS:
+            found.append(("call_attr", func.attr))
+            return True
+    elif func_type is _NAME:
+        if func.id in FORBIDDEN_BUILTINS:
+            found.append(("call_name", func.id))
+            return True
+    return False
+
+_NODE_COLLECTORS = {
+    ast.Import: _collect_import,
+    ast.ImportFrom: _collect_import_from,
+    ast.Name: _collect_name,
+    ast.Call: _collect_call,
+}
+
+@lru_cache(maxsize=256)
+def _extract_sensitive_nodes(code):
+    try:
+        tree = compile(code, "<sandbox>", "exec", flags=ast.PyCF_ONLY_AST, dont_inherit=True)
     except Exception as e:
         raise CodeSafetyError(f"AST parsing error: {e}")
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                root = alias.name.split(".")[0]
-                if root in FORBIDDEN_MODULES:
-                    raise CodeSafetyError(f"Forbidden import detected: {alias.name}")
-                if not _is_import_allowed(alias.name):
-                    raise CodeSafetyError(f"Import not allowed by policy: {alias.name}")
-
-        if isinstance(node, ast.ImportFrom):
-            mod = (node.module or "")
-            root = mod.split(".")[0] if mod else ""
-            if root in FORBIDDEN_MODULES:
-                raise CodeSafetyError(f"Forbidden import from detected: {mod}")
-            if mod and not _is_import_allowed(mod):
-                raise CodeSafetyError(f"Import not allowed by policy: {mod}")
-
-        if isinstance(node, ast.Name) and node.id in FORBIDDEN_BUILTINS:
-            raise CodeSafetyError(f"Forbidden builtin usage: {node.id}")
-
-        if isinstance(node, ast.Call):
-            func = node.func
-            if isinstance(func, ast.Attribute):
-                attr_name = func.attr
-                if attr_name in FORBIDDEN_ATTRS:
-                    raise CodeSafetyError(f"Forbidden attribute call detected: .{attr_name}()")
-            elif isinstance(func, ast.Name):
-                if func.id in FORBIDDEN_BUILTINS:
-                    raise CodeSafetyError(f"Forbidden function call detected: {func.id}()")
+    found = []
+    get_collector = _NODE_COLLECTORS.get
+    node_type, list_type = ast.AST, list
+    isinstance_, getattr_, type_ = isinstance, getattr, type
+    todo = deque([tree])
+    pop, push = todo.popleft, todo.append
+    while todo:
+        node = pop()
+        for field in node._fields:
+            value = getattr_(node, field, None)
+            if isinstance_(value, node_type):
+                push(value)
+            elif value.__class__ is list_type:
+                for item in value:
+                    if isinstance_(item, node_type):
+                        push(item)
+        collect = get_collector(type_(node))
+        if collect is not None and collect(node, found):
+            break
+    return tuple(found)
+
+def _check_code_ast(code):
+    for kind, name in _extract_sensitive_nodes(code):
+        if kind == "import":
+            if name.split(".")[0] in FORBIDDEN_MODULES:
+                raise CodeSafetyError(f"Forbidden import detected: {name}")
+            if not _is_import_allowed(name):
+                raise CodeSafetyError(f"Import not allowed by policy: {name}")
+        elif kind == "import_from":
+            if name and name.split(".")[0] in FORBIDDEN_MODULES:
+                raise CodeSafetyError(f"Forbidden import from detected: {name}")
+            if name and not _is_import_allowed(name):
+                raise CodeSafetyError(f"Import not allowed by policy: {name}")
+        elif kind == "name":
+            raise CodeSafetyError(f"Forbidden builtin usage: {name}")
+        elif kind == "call_attr":
+            raise CodeSafetyError(f"Forbidden attribute call detected: .{name}()")
+        elif kind == "call_name":
+            raise CodeSafetyError(f"Forbidden function call detected: {name}()")
 
     if sys.version_info >= (3, 8):
         pass
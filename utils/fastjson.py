@@ -0,0 +1,25 @@
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+JSONDecodeError = json.JSONDecodeError
+
+if ORJSON_AVAILABLE:
+    loads = orjson.loads
+else:
+    loads = json.loads
+
+
+def dumps(obj: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, default=default, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, default=default, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), default=default, ensure_ascii=False).encode("utf-8")
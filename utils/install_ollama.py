@@ -2,15 +2,20 @@ import subprocess
 import sys
 import time
 import requests
-from typing import Optional, Tuple
+from requests.adapters import HTTPAdapter
+from typing import Dict, Optional, Tuple
 import logging
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+START_TIMEOUT = 10.0
+INSTALLED_CACHE_TTL = 300.0
+RUNNING_CACHE_TTL = 2.0
+
+_installed_until = 0.0
+_running_until: Dict[str, float] = {}
+
 class OllamaInstaller:
     def __init__(self, model: Optional[str] = None, base_url: str = "http://localhost:11434"):
         if model is None:
@@ -18,8 +23,13 @@ class OllamaInstaller:
         else:
             self.model = model
         self.base_url = base_url
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
 
     def is_ollama_installed(self) -> bool:
+        global _installed_until
+        if _installed_until > time.monotonic():
+            return True
         try:
             result = subprocess.run(
                 ["ollama", "--version"],
@@ -29,9 +39,12 @@ class OllamaInstaller:
                 errors='replace',
                 timeout=10
             )
-            return result.returncode == 0
         except (subprocess.TimeoutExpired, FileNotFoundError):
             return False
+        if result.returncode != 0:
+            return False
+        _installed_until = time.monotonic() + INSTALLED_CACHE_TTL
+        return True
 
     def install_ollama(self) -> Tuple[bool, str]:
         try:
@@ -65,11 +78,28 @@ winget install --id Ollama.Ollama --accept-source-agreements --accept-package-ag
             return False, manual_instructions
 
     def is_ollama_running(self) -> bool:
+        if _running_until.get(self.base_url, 0.0) > time.monotonic():
+            return True
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            return response.status_code == 200
+            response = self._session.get(f"{self.base_url}/api/tags", timeout=5)
         except requests.RequestException:
+            response = None
+        if response is None or response.status_code != 200:
+            _running_until.pop(self.base_url, None)
             return False
+        _running_until[self.base_url] = time.monotonic() + RUNNING_CACHE_TTL
+        return True
+
+    def wait_until_running(self, timeout: float = START_TIMEOUT) -> bool:
+        deadline = time.monotonic() + timeout
+        delay = 0.05
+        while True:
+            if self.is_ollama_running():
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(delay)
+            delay = min(delay * 1.6, 1.0)
 
     def start_ollama(self) -> Tuple[bool, str]:
         try:
@@ -81,9 +111,7 @@ winget install --id Ollama.Ollama --accept-source-agreements --accept-package-ag
                 creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
             )
 
-            time.sleep(3)
-
-            if self.is_ollama_running():
+            if self.wait_until_running():
                 print("✓ Ollama service started successfully!")
                 return True, "Service started"
             else:
@@ -95,7 +123,7 @@ winget install --id Ollama.Ollama --accept-source-agreements --accept-package-ag
     def is_model_available(self, model: Optional[str] = None) -> bool:
         model = model or self.model
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self._session.get(f"{self.base_url}/api/tags", timeout=5)
             if response.status_code == 200:
                 models = response.json().get("models", [])
                 return any(m.get("name") == model for m in models)
@@ -142,8 +170,6 @@ winget install --id Ollama.Ollama --accept-source-agreements --accept-package-ag
             if not success:
                 return False, "\n".join(messages)
 
-            time.sleep(2)
-
         if not self.is_model_available():
             success, msg = self.pull_model()
             messages.append(msg)
@@ -168,6 +194,9 @@ def setup_ollama(model: Optional[str] = None, base_url: str = "http://localhost:
 
 if __name__ == "__main__":
     import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
     parser = argparse.ArgumentParser(description="Install and set up Ollama for Zen.")
     parser.add_argument("--model", default=os.getenv("OLLAMA_MODEL", "mistral:7b"), help="Model to pull (default: mistral:7b)")
@@ -1,7 +1,11 @@
 import importlib
+import re
 import subprocess
 import sys
-from typing import Iterator, Tuple, Optional, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Callable, Dict, Tuple, Optional, List
 
 try:
     from importlib import metadata
@@ -12,37 +16,74 @@ from loader import SingleBrailleLoader
 
 try:
     from packaging.requirements import Requirement
+    from packaging.utils import canonicalize_name
+    from packaging.version import InvalidVersion, Version
     PACKAGING_AVAILABLE = True
 except Exception:
     PACKAGING_AVAILABLE = False
 
+    def canonicalize_name(name: str) -> str:
+        return re.sub(r"[-_.]+", "-", name).lower()
 
-def iter_requirements(filename: str) -> Iterator[str]:
+
+def iter_requirements(filename: str) -> List[str]:
     with open(filename, "r", encoding="utf-8") as f:
-        for raw in f:
-            line = raw.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "#" in line and not line.lstrip().startswith(("http://", "https://")):
-                line = line.split("#", 1)[0].strip()
-            if line:
-                yield line
+        lines = [raw.strip() for raw in f.read().splitlines()]
+    lines = [
+        line if line.startswith(("http://", "https://")) else line.split("#", 1)[0].strip()
+        for line in lines
+        if line and not line.startswith("#")
+    ]
+    return [line for line in lines if line]
+
+
+def installed_versions() -> Dict[str, str]:
+    installed: Dict[str, str] = {}
+    for dist in metadata.distributions():
+        name = dist.metadata["Name"]
+        if name:
+            installed.setdefault(canonicalize_name(name), dist.version)
+    return installed
 
 
-def requirement_status(spec: str) -> Tuple[str, str, Optional[str]]:
+@lru_cache(maxsize=None)
+def _parse_requirement(spec: str) -> Optional["Requirement"]:
+    try:
+        return Requirement(spec)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _parse_version(version: str):
+    try:
+        return Version(version)
+    except InvalidVersion:
+        return version
+
+
+def requirement_status(spec: str, installed: Optional[Dict[str, str]] = None) -> Tuple[str, str, Optional[str]]:
     if PACKAGING_AVAILABLE:
-        try:
-            req = Requirement(spec)
-        except Exception:
+        req = _parse_requirement(spec)
+        if req is None:
             return "install", spec, None
 
-        try:
-            installed_version = metadata.version(req.name)
-        except metadata.PackageNotFoundError:
-            return "install", spec, None
+        if installed is not None:
+            installed_version = installed.get(canonicalize_name(req.name))
+            if installed_version is None:
+                return "install", spec, None
+        else:
+            try:
+                installed_version = metadata.version(req.name)
+            except metadata.PackageNotFoundError:
+                return "install", spec, None
 
-        if req.specifier and not req.specifier.contains(installed_version, prereleases=True):
-            return "upgrade", spec, installed_version
+        if req.specifier:
+            specifiers = list(req.specifier)
+            if len(specifiers) == 1 and specifiers[0].operator == "==" and specifiers[0].version == installed_version:
+                return "skip", spec, installed_version
+            if not req.specifier.contains(_parse_version(installed_version), prereleases=True):
+                return "upgrade", spec, installed_version
 
         return "skip", spec, installed_version
 
@@ -56,26 +97,45 @@ def requirement_status(spec: str) -> Tuple[str, str, Optional[str]]:
     return "install", spec, None
 
 
-def pip_install(spec: str) -> Tuple[int, str]:
+PIP_OUTPUT_TAIL = 50
+
+
+def pip_install(*specs: str, on_line: Optional[Callable[[str], None]] = None) -> Tuple[int, str]:
     cmd = [
         sys.executable, "-m", "pip", "install",
         "--disable-pip-version-check",
-        "-q",
-        spec,
+        "--progress-bar", "off",
+        "--no-input",
+        "--no-color",
+        *specs,
     ]
-    result = subprocess.run(
+    tail = deque(maxlen=PIP_OUTPUT_TAIL)
+    with subprocess.Popen(
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
+        bufsize=1,
         text=True,
         encoding='utf-8',
         errors='replace',
-    )
-    return result.returncode, result.stdout
+    ) as proc:
+        for line in proc.stdout:
+            line = line.rstrip()
+            if not line:
+                continue
+            tail.append(line)
+            if on_line:
+                on_line(line)
+    return proc.returncode, "\n".join(tail)
+
+
+def _pip_status(line: str) -> str:
+    line = line.strip()
+    return line if len(line) <= 60 else line[:57] + "..."
 
 
 def install_packages_from_file(filename: str = "utils/requirements.txt", retry_failed: bool = True, max_retries: int = 3) -> None:
-    specs = list(iter_requirements(filename))
+    specs = iter_requirements(filename)
     if not specs:
         print(f"No requirements found in {filename}.")
         return
@@ -93,10 +153,15 @@ def install_packages_from_file(filename: str = "utils/requirements.txt", retry_f
         upgraded_count = 0
         skipped_count = 0
 
-        for i, spec in enumerate(specs, 1):
+        pending: List[Tuple[str, str, str]] = []
+
+        loader.set_status("Checking installed packages...")
+        installed = installed_versions() if PACKAGING_AVAILABLE else None
+        with ThreadPoolExecutor(max_workers=min(8, len(specs))) as executor:
+            statuses = list(executor.map(partial(requirement_status, installed=installed), specs))
+
+        for action, spec, installed_version in statuses:
             display_spec = spec if len(spec) <= 30 else spec[:27] + "..."
-            
-            action, _, installed_version = requirement_status(spec)
 
             if action == "skip":
                 loader.set_status(f"✓ {display_spec} (already installed)")
@@ -104,13 +169,44 @@ def install_packages_from_file(filename: str = "utils/requirements.txt", retry_f
                 loader.update()
                 continue
 
+            pending.append((spec, display_spec, action))
+
+        if pending:
+            loader.set_status(f"Installing {len(pending)} package(s)...")
+            code, output = pip_install(
+                *(spec for spec, _, _ in pending),
+                on_line=lambda line: loader.set_status(_pip_status(line)),
+            )
+
+            if code == 0:
+                for spec, display_spec, action in pending:
+                    if action == "install":
+                        installed_count += 1
+                    else:
+                        upgraded_count += 1
+                loader.set_status(f"✓ {len(pending)} package(s) installed")
+                loader.update(len(pending))
+                pending = []
+            else:
+                importlib.invalidate_caches()
+
+        for spec, display_spec, action in pending:
+            if requirement_status(spec)[0] == "skip":
+                if action == "install":
+                    installed_count += 1
+                else:
+                    upgraded_count += 1
+                loader.set_status(f"✓ {display_spec} installed")
+                loader.update()
+                continue
+
             verb = "Installing" if action == "install" else "Upgrading"
             success = False
             
             for attempt in range(max_retries if retry_failed else 1):
                 loader.set_status(f"{verb} {display_spec}...")
                 
-                code, output = pip_install(spec)
+                code, output = pip_install(spec, on_line=lambda line: loader.set_status(_pip_status(line)))
                 
                 if code == 0:
                     if action == "install":
@@ -1,3 +1,4 @@
+import os
 import sys
 import time
 from typing import Optional
@@ -8,14 +9,41 @@ class SingleBrailleLoader:
     _max_level = len(_levels) - 1
     _GREEN = "\033[92m"
     _RESET = "\033[0m"
+    _DONE_CHAR = f"{_GREEN}{_levels[-1]}{_RESET}"
 
     def __init__(self, total: int, stream: Optional[sys.stdout] = None):
         self.total = total
         self.stream = stream or sys.stdout
         self.current = 0
         self.start_time = time.time()
+        self._start_ns = time.monotonic_ns()
         self._finished = False
         self.status = ""
+        self.update_every = 0.0
+        self._last_line = ""
+        self._last_render_ns = 0
+        self._fd = self._tty_fd(self.stream)
+        if self._fd is not None:
+            self.stream.flush()
+
+    @staticmethod
+    def _tty_fd(stream) -> Optional[int]:
+        if sys.platform == "win32":
+            return None
+        try:
+            return stream.fileno() if stream.isatty() else None
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    def _write(self, text: str) -> None:
+        if self._fd is None:
+            self.stream.write(text)
+            self.stream.flush()
+            return
+        data = text.encode("utf-8")
+        while data:
+            written = os.write(self._fd, data)
+            data = data[written:]
 
     def update(self, step: int = 1) -> None:
         self.current = min(self.total, self.current + step)
@@ -25,35 +53,34 @@ class SingleBrailleLoader:
         if self._finished:
             return
 
-        progress = self.current / self.total if self.total > 0 else 1.0
-        idx = int(round(progress * self._max_level))
-
-        elapsed = time.time() - self.start_time
-        eta = (elapsed / progress) - elapsed if progress > 0 else 0
+        done = self.current >= self.total
+        now_ns = time.monotonic_ns()
+        if not done and now_ns - self._last_render_ns < self.update_every * 1e9:
+            return
 
-        percent = int(progress * 100)
-        elapsed_str = f"{elapsed:.1f}s"
+        elapsed_ns = now_ns - self._start_ns
 
-        if self.current >= self.total:
-            char = f"{self._GREEN}{self._levels[-1]}{self._RESET}"
-            eta_str = "done"
-            status_to_print = self.status
-            status_str = ""
+        if done:
+            line = f"\r{self._DONE_CHAR} 100% [{elapsed_ns / 1e9:.1f}s<done]"
         else:
-            char = self._levels[idx]
-            eta_str = f"{eta:.1f}s" if eta < 3600 else f"{eta/3600:.1f}h"
-            status_to_print = ""
+            percent = self.current * 100 // self.total
+            char = self._levels[self.current * self._max_level // self.total]
+            eta_ns = elapsed_ns * (self.total - self.current) // self.current if self.current else 0
+            eta_str = f"{eta_ns / 1e9:.1f}s" if eta_ns < 3_600_000_000_000 else f"{eta_ns / 3.6e12:.1f}h"
             status_str = f" {self.status}" if self.status else ""
+            line = f"\r{char} {percent:3d}% [{elapsed_ns / 1e9:.1f}s<{eta_str}]{status_str}"
+            if line == self._last_line:
+                return
 
-        self.stream.write(f"\r{char} {percent:3d}% [{elapsed_str}<{eta_str}]{status_str}")
-        self.stream.flush()
-
-        if self.current >= self.total:
+        if done:
             self._finished = True
-            self.stream.write('\n')
-            if status_to_print:
-                self.stream.write(f"{status_to_print}\n")
-                self.stream.flush()
+            line += '\n'
+            if self.status:
+                line += f"{self.status}\n"
+
+        self._write(line)
+        self._last_line = line
+        self._last_render_ns = now_ns
 
     def start(self) -> None:
         pass